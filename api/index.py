@@ -3,7 +3,16 @@ import sys
 from pathlib import Path
 
 # Add project root to Python path
-project_root = Path(__file__).resolve().parent.parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from config import settings
 from src.api.main import app
+
+# Import the active storage backend up front so its heavy dependencies
+# (pandas, SQLAlchemy/asyncpg) load during the function's init phase and stay
+# in the warm interpreter, rather than on the first data request.
+if settings.use_postgres:
+    import src.storage.postgres_storage  # noqa: F401
+else:
+    import src.storage.csv_storage  # noqa: F401
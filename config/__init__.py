@@ -1,4 +1,4 @@
 """Configuration package."""
-from config.settings import settings
+from config.settings import get_settings, settings
 
-__all__ = ["settings"]
+__all__ = ["get_settings", "settings"]
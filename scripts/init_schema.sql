@@ -0,0 +1,21 @@
+-- Schema bootstrap for the Brazilian CDS datafeeder.
+--
+-- Idempotent: run once per database (and again after schema changes) with
+--   psql "$NEON_DATABASE_URL" -f scripts/init_schema.sql
+--
+-- Mirrors src/database/models.py; keep both in sync. Databases created
+-- before the value columns became DOUBLE PRECISION need
+-- scripts/migrate_numeric_to_double.sql once.
+
+CREATE TABLE IF NOT EXISTS cds_data (
+    date        DATE             NOT NULL PRIMARY KEY,
+    open        DOUBLE PRECISION,
+    high        DOUBLE PRECISION,
+    low         DOUBLE PRECISION,
+    close       DOUBLE PRECISION NOT NULL,
+    change_pct  DOUBLE PRECISION,
+    created_at  TIMESTAMP        NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMP        NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_cds_date_desc ON cds_data (date DESC);
@@ -8,6 +8,7 @@ It includes validation and integrity checks to ensure data quality.
 import asyncio
 import sys
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -17,22 +18,38 @@ import pandas as pd
 from loguru import logger
 
 from config.settings import settings
-from src.database.connection import get_db_session, create_tables
+from src.database import CDSData
+from src.database.connection import get_db_session, table_exists
+from src.storage import CDSStorage
 from src.storage.postgres_storage import PostgresStorage
 
+# Rows per chunk when reading the CSV with pandas
+CSV_CHUNK_SIZE = 10_000
 
-def validate_csv_data(df: pd.DataFrame) -> bool:
+# Column types applied while parsing; float32 is enough for validation and
+# halves the memory of each chunk
+CSV_DTYPES = {
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+    "change_pct": "float32",
+}
+
+
+def validate_csv_data(df: pd.DataFrame, seen_dates: Optional[set] = None) -> bool:
     """
     Validate CSV data before migration.
     
     Args:
-        df: DataFrame containing CSV data
+        df: DataFrame containing CSV data (or one chunk of it), read with
+            CSV_DTYPES and the date column parsed
+        seen_dates: Dates found in previous chunks. Updated in place so
+            duplicates are detected across chunks.
         
     Returns:
         True if data is valid, False otherwise
     """
-    logger.info("Validating CSV data...")
-    
     # Check required columns
     required_columns = ["date", "open", "high", "low", "close", "change_pct"]
     missing_columns = [col for col in required_columns if col not in df.columns]
@@ -42,29 +59,78 @@ def validate_csv_data(df: pd.DataFrame) -> bool:
         return False
     
     # Check for null values in critical columns
-    null_counts = df[required_columns].isnull().sum()
+    null_counts = df[required_columns].isna().sum(axis=0)
     if null_counts.any():
         logger.warning(f"Found null values:\n{null_counts[null_counts > 0]}")
     
-    # Check data types
-    try:
-        df["date"] = pd.to_datetime(df["date"])
-        for col in ["open", "high", "low", "close", "change_pct"]:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-    except Exception as e:
-        logger.error(f"Data type conversion failed: {e}")
+    # Numeric columns are typed by read_csv (see CSV_DTYPES); dates must have parsed
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        logger.error("Data type conversion failed: unparseable values in 'date'")
         return False
     
     # Check for duplicate dates
-    duplicates = df[df["date"].duplicated()]
-    if not duplicates.empty:
-        logger.warning(f"Found {len(duplicates)} duplicate dates")
+    duplicates = df["date"].duplicated()
+    if seen_dates is not None:
+        duplicates |= df["date"].isin(seen_dates)
+        seen_dates.update(df["date"])
+    if duplicates.any():
+        logger.warning(f"Found {duplicates.sum()} duplicate dates")
         logger.info("Will keep the latest record for each date")
     
-    logger.success(f"CSV validation passed. Total records: {len(df)}")
     return True
 
 
+async def validate_csv_file(csv_path: Path) -> Optional[Tuple[List[str], int]]:
+    """
+    Validate a CSV file chunk by chunk.
+    
+    Only one chunk is held in memory at a time; the blocking reads run in a
+    worker thread.
+    
+    Args:
+        csv_path: Path to the CSV file
+        
+    Returns:
+        Tuple of (column names in file order, total records) if the data is
+        valid, None otherwise
+    """
+    logger.info("Validating CSV data...")
+    
+    columns: List[str] = []
+    seen_dates: set = set()
+    total = 0
+    
+    try:
+        reader = pd.read_csv(
+            csv_path,
+            chunksize=CSV_CHUNK_SIZE,
+            dtype=CSV_DTYPES,
+            parse_dates=["date"],
+        )
+    except ValueError as e:
+        logger.error(f"Could not read CSV: {e}")
+        return None
+    
+    # Closing the reader releases its file handle on every exit path
+    with reader:
+        while True:
+            try:
+                chunk = await asyncio.to_thread(next, reader, None)
+            except ValueError as e:
+                logger.error(f"Data type conversion failed: {e}")
+                return None
+            if chunk is None:
+                break
+            if not columns:
+                columns = list(chunk.columns)
+            if not validate_csv_data(chunk, seen_dates):
+                return None
+            total += len(chunk)
+    
+    logger.success(f"CSV validation passed. Total records: {total}")
+    return columns, total
+
+
 async def migrate_data():
     """
     Main migration function.
@@ -82,39 +148,39 @@ async def migrate_data():
         logger.info(f"Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'}")
         
         # Check if CSV file exists
-        csv_path = Path(settings.CSV_DATA_PATH)
+        csv_path = Path(settings.csv_data_path)
         if not csv_path.exists():
             logger.error(f"CSV file not found: {csv_path}")
             logger.info("Please run the data update script first to generate CSV data")
             return False
         
-        # Read CSV data
+        # Validate data (the bulk load itself streams the file via COPY)
         logger.info(f"Reading CSV data from: {csv_path}")
-        df = pd.read_csv(csv_path)
+        validation = await validate_csv_file(csv_path)
         
-        if df.empty:
+        if validation is None:
+            logger.error("Data validation failed. Migration aborted.")
+            return False
+        
+        columns, total = validation
+        if total == 0:
             logger.warning("CSV file is empty. Nothing to migrate.")
             return True
         
-        logger.info(f"Loaded {len(df)} records from CSV")
-        
-        # Validate data
-        if not validate_csv_data(df):
-            logger.error("Data validation failed. Migration aborted.")
+        # Schema is bootstrapped once at deploy time (scripts/init_schema.sql)
+        if not await table_exists(CDSData.__tablename__):
+            logger.error(f"Table '{CDSData.__tablename__}' not found. Migration aborted.")
+            logger.info('Create the schema first: psql "$NEON_DATABASE_URL" -f scripts/init_schema.sql')
             return False
         
-        # Create database tables if they don't exist
-        logger.info("Ensuring database tables exist...")
-        await create_tables()
-        
         # Initialize storage
         storage = PostgresStorage()
         
         # Check if database already has data
-        existing_data = await storage.load_existing_data()
+        existing_stats = await storage.get_stats()
         
-        if not existing_data.empty:
-            logger.warning(f"Database already contains {len(existing_data)} records")
+        if existing_stats["total_records"] > 0:
+            logger.warning(f"Database already contains {existing_stats['total_records']} records")
             response = await asyncio.to_thread(
                 input, "Do you want to proceed? This will update existing records (y/n): "
             )
@@ -123,21 +189,25 @@ async def migrate_data():
                 return False
         
         # Migrate data
-        logger.info("Migrating data to PostgreSQL...")
-        count = await storage.upsert_data(df)
+        logger.info("Migrating data to PostgreSQL (COPY)...")
+        count = await storage.copy_from_csv(csv_path, columns=columns)
         
         if count > 0:
             logger.success(f"Successfully migrated {count} records to PostgreSQL")
             
             # Verify migration
             logger.info("Verifying migration...")
-            migrated_data = await storage.load_existing_data()
-            logger.success(f"Verification complete. Database contains {len(migrated_data)} records")
+            stats = await storage.get_stats()
+            logger.success(f"Verification complete. Database contains {stats['total_records']} records")
             
             # Show latest record
-            latest = await storage.get_latest()
-            if latest:
-                logger.info(f"Latest record: {latest['date']} - Close: {latest['close']}")
+            if stats["latest_date"]:
+                logger.info(f"Latest record: {stats['latest_date']} - Close: {stats['latest_close']}")
+            
+            # Keep the CSV backend's Parquet companion in step with the file
+            # (the API only reads it, never rebuilds it)
+            if await asyncio.to_thread(CDSStorage(csv_path).build_parquet):
+                logger.info("Parquet companion rebuilt from CSV")
             
             return True
         else:
@@ -158,37 +228,39 @@ async def verify_migration():
         logger.info("Verifying data consistency...")
         
         # Read CSV
-        csv_path = Path(settings.CSV_DATA_PATH)
+        csv_path = Path(settings.csv_data_path)
         if not csv_path.exists():
             logger.warning("CSV file not found for verification")
             return
         
-        csv_df = pd.read_csv(csv_path)
-        csv_df["date"] = pd.to_datetime(csv_df["date"])
+        csv_dates = set()
+        csv_count = 0
+        for chunk in pd.read_csv(csv_path, usecols=["date"], chunksize=CSV_CHUNK_SIZE):
+            csv_dates.update(pd.to_datetime(chunk["date"]))
+            csv_count += len(chunk)
         
         # Read from database
         storage = PostgresStorage()
         db_df = await storage.load_existing_data()
         
         # Compare counts
-        logger.info(f"CSV records: {len(csv_df)}")
+        logger.info(f"CSV records: {csv_count}")
         logger.info(f"Database records: {len(db_df)}")
         
-        if len(csv_df) == len(db_df):
+        if csv_count == len(db_df):
             logger.success("Record counts match ✓")
         else:
-            logger.warning(f"Record count mismatch: CSV={len(csv_df)}, DB={len(db_df)}")
+            logger.warning(f"Record count mismatch: CSV={csv_count}, DB={len(db_df)}")
         
         # Compare date ranges
-        csv_dates = sorted(csv_df["date"].unique())
-        db_dates = sorted(db_df["date"].unique())
+        db_dates = set(db_df["date"])
         
-        logger.info(f"CSV date range: {csv_dates[0]} to {csv_dates[-1]}")
-        logger.info(f"DB date range: {db_dates[0]} to {db_dates[-1]}")
+        logger.info(f"CSV date range: {min(csv_dates)} to {max(csv_dates)}")
+        logger.info(f"DB date range: {min(db_dates)} to {max(db_dates)}")
         
         # Check for missing dates
-        missing_in_db = set(csv_dates) - set(db_dates)
-        missing_in_csv = set(db_dates) - set(csv_dates)
+        missing_in_db = csv_dates - db_dates
+        missing_in_csv = db_dates - csv_dates
         
         if missing_in_db:
             logger.warning(f"Dates in CSV but not in DB: {len(missing_in_db)}")
@@ -0,0 +1,17 @@
+-- One-off migration: cds_data value columns NUMERIC(10, 4) -> DOUBLE PRECISION.
+--
+-- Only needed for databases created with the old schema:
+--   psql "$NEON_DATABASE_URL" -f scripts/migrate_numeric_to_double.sql
+--
+-- Rewrites the table once under an exclusive lock; the data is small.
+
+BEGIN;
+
+ALTER TABLE cds_data
+    ALTER COLUMN open       TYPE DOUBLE PRECISION USING open::double precision,
+    ALTER COLUMN high       TYPE DOUBLE PRECISION USING high::double precision,
+    ALTER COLUMN low        TYPE DOUBLE PRECISION USING low::double precision,
+    ALTER COLUMN close      TYPE DOUBLE PRECISION USING close::double precision,
+    ALTER COLUMN change_pct TYPE DOUBLE PRECISION USING change_pct::double precision;
+
+COMMIT;
@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).resolve().parent.parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import uvicorn
@@ -18,6 +18,10 @@ def main():
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.API_RELOAD,
+        # Pin the fast implementations (shipped with uvicorn[standard]) instead
+        # of silently falling back to asyncio/h11 if they go missing
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
 
 
@@ -5,12 +5,13 @@ import sys
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).resolve().parent.parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import settings
 from src.scrapers import fetch_investing_cds
 from src.storage import CDSStorage
+from src.database import close_db, get_db_session
 from src.storage.postgres_storage import PostgresStorage
 from src.utils import setup_logging, get_logger
 
@@ -31,12 +32,25 @@ async def update_with_postgres(new_data):
     return stats
 
 
+async def warm_database():
+    """Open a pooled database connection ahead of the upsert.
+    
+    Runs alongside the scrape so the TCP/TLS handshake (and a Neon compute
+    wake-up, if suspended) overlaps with the HTTP fetch.
+    """
+    from sqlalchemy import text
+    
+    async with get_db_session() as session:
+        await session.execute(text("SELECT 1"))
+
+
 def update_with_csv(new_data):
     """Update CDS data using CSV storage."""
     logger = get_logger()
     
     logger.info("Usando CSV para armazenamento local...")
     storage = CDSStorage()
+    # save_data also rewrites the Parquet companion (when pyarrow is installed)
     storage.update_from_scraper(new_data)
     logger.success("✓ Dados atualizados no arquivo CSV")
     
@@ -58,9 +72,13 @@ async def async_main():
     logger.info("=" * 60)
     
     try:
-        # Fetch new data
+        # Fetch new data (blocking HTTP runs in a thread to keep the loop free)
         logger.info("Buscando dados do Investing.com...")
-        new_data = fetch_investing_cds()
+        fetch = asyncio.to_thread(fetch_investing_cds)
+        if settings.use_postgres and settings.DATABASE_URL:
+            new_data, _ = await asyncio.gather(fetch, warm_database())
+        else:
+            new_data = await fetch
         logger.success(f"✓ Dados capturados: {len(new_data)} registros")
         
         # Update storage based on environment
@@ -88,6 +106,9 @@ async def async_main():
         logger.error(f"✗ Erro durante atualização: {e}")
         logger.exception("Detalhes do erro:")
         return 1
+    finally:
+        # Release pooled connections before the event loop closes
+        await close_db()
 
 
 def main():
@@ -21,13 +21,18 @@ setup(
         "requests>=2.28.0",
         "lxml>=4.9.0",
         "loguru>=0.7.0",
-        "logtail-python>=0.3.0",
         "python-dotenv>=1.0.0",
         "fastapi>=0.100.0",
         "uvicorn[standard]>=0.23.0",
+        "uvloop>=0.17.0; sys_platform != 'win32'",
+        "httptools>=0.6.0",
         "pydantic>=2.0.0",
+        "orjson>=3.9.0",
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=14.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
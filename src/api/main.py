@@ -1,6 +1,7 @@
 """FastAPI application for Brazilian CDS data."""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from config import settings
 from src.api.routes import cds_router, health_router, home_router, favicon_router
@@ -19,14 +20,24 @@ app = FastAPI(
 )
 
 # Add CORS middleware
+# The API is public and read-only, so no credentials: the wildcard origin is
+# returned instead of echoing each request's Origin (Starlette still adds
+# Vary: Origin). ETag is exposed for conditional requests from browsers, and
+# preflights are cached for a day instead of repeating OPTIONS before each call.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+    max_age=86400,
 )
 
+# Compress larger bodies (CDS history JSON shrinks several-fold); small
+# responses such as /health are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(favicon_router)  # Favicon must be early for browser requests
 app.include_router(home_router)  # Home page must be first for root route
@@ -41,6 +52,19 @@ async def startup_event():
     logger = get_logger()
     logger.info(f"Starting {settings.API_TITLE} v{settings.API_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
+    
+    # Build the engine once so every request shares its pool; connections
+    # themselves are opened lazily, on first use
+    if settings.use_postgres:
+        from src.database import init_db
+        try:
+            init_db()
+        except Exception:
+            logger.warning("Database pool not initialized at startup; retrying on first request")
+    else:
+        # Parse the CSV once now instead of on the first data request
+        from src.api.routes.cds import get_storage
+        get_storage().preload()
 
 
 @app.on_event("shutdown")
@@ -49,9 +73,15 @@ async def shutdown_event():
     from src.utils import get_logger
     logger = get_logger()
     logger.info("Shutting down API")
+    
+    if settings.use_postgres:
+        from src.database import close_db
+        await close_db()
 
 
 if __name__ == "__main__":
+    import sys
+    
     import uvicorn
     
     uvicorn.run(
@@ -59,4 +89,6 @@ if __name__ == "__main__":
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.API_RELOAD,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
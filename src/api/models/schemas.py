@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CDSRecord(BaseModel):
@@ -16,9 +16,12 @@ class CDSRecord(BaseModel):
     close: Optional[float] = Field(None, description="Closing value")
     change_pct: Optional[float] = Field(None, description="Percentage change")
     
-    class Config:
-        populate_by_name = True
-        json_schema_extra = {
+    # Immutable value object; routes serialize DataFrames directly and only
+    # use this model for the OpenAPI schema
+    model_config = ConfigDict(
+        populate_by_name=True,
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "date": "2025-11-07",
                 "open": 0.0145,
@@ -27,7 +30,8 @@ class CDSRecord(BaseModel):
                 "close": 0.0146,
                 "change_pct": 0.68
             }
-        }
+        },
+    )
 
 
 class HealthResponse(BaseModel):
@@ -35,13 +39,14 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="API version")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "version": "1.0.0"
             }
-        }
+        },
+    )
 
 
 class CDSStatsResponse(BaseModel):
@@ -51,15 +56,16 @@ class CDSStatsResponse(BaseModel):
     latest_date: Optional[str] = Field(None, description="Latest date in dataset")
     latest_close: Optional[float] = Field(None, description="Latest closing value")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_records": 1500,
                 "oldest_date": "2020-01-01",
                 "latest_date": "2025-11-07",
                 "latest_close": 0.0146
             }
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -67,10 +73,11 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
     detail: Optional[str] = Field(None, description="Detailed error information")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": "Data not found",
                 "detail": "No CDS data available for the specified date range"
             }
-        }
+        },
+    )
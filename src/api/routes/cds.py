@@ -1,21 +1,135 @@
 """API routes for CDS data."""
-from typing import List, Optional
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, List, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from config import settings
 from src.api.models import CDSRecord, CDSStatsResponse, ErrorResponse
-from src.storage import CDSStorage
-from src.storage.postgres_storage import PostgresStorage
+
+if TYPE_CHECKING:
+    from src.storage import CDSStorage
+    from src.storage.postgres_storage import PostgresStorage
 
 router = APIRouter(prefix="/cds", tags=["CDS Data"])
 
+# Data changes once per scrape cycle; let clients reuse responses for a while
+CACHE_CONTROL = "public, max-age=300"
+
+# Rows serialized per chunk by /cds/stream
+STREAM_CHUNK_ROWS = 1000
+
+# Storage backends are imported on first use so only the configured one is
+# ever loaded (a CSV deployment never imports SQLAlchemy/asyncpg). The Vercel
+# entry point (api/index.py) still pre-imports the active backend on purpose,
+# so its cost lands in the function's init phase rather than a request.
+
+
+@lru_cache(maxsize=None)
+def _postgres_storage() -> "PostgresStorage":
+    """Get the shared PostgreSQL storage (backed by the engine's connection pool)."""
+    from src.storage.postgres_storage import PostgresStorage
+    return PostgresStorage()
 
-def get_storage():
+
+@lru_cache(maxsize=None)
+def _csv_storage() -> "CDSStorage":
+    """Get the shared CSV storage."""
+    from src.storage import CDSStorage
+    return CDSStorage()
+
+
+def get_storage() -> Union["CDSStorage", "PostgresStorage"]:
     """Get the appropriate storage based on environment configuration."""
     if settings.use_postgres:
-        return PostgresStorage()
-    return CDSStorage()
+        return _postgres_storage()
+    return _csv_storage()
+
+
+def _records_response(df, headers: Optional[dict] = None) -> Response:
+    """Serialize CDS records straight to JSON.
+    
+    Uses pandas' C JSON writer on the columns directly, so no Python dict
+    or CDSRecord is built per row; response_model is still used for the
+    OpenAPI schema.
+    
+    Args:
+        df: DataFrame with CDS data
+        headers: Extra response headers
+        
+    Returns:
+        JSON response with a list of records
+    """
+    return Response(content=_to_json(df).encode(), media_type="application/json", headers=headers)
+
+
+def _to_json(df, lines: bool = False) -> str:
+    """Encode CDS records as a JSON array (or JSON lines) with YYYY-MM-DD dates."""
+    return df.assign(date=df["date"].dt.strftime("%Y-%m-%d")).to_json(orient="records", lines=lines)
+
+
+def _iter_records(df, fmt: str) -> Iterator[bytes]:
+    """Serialize CDS records incrementally, STREAM_CHUNK_ROWS at a time.
+    
+    Args:
+        df: DataFrame with CDS data
+        fmt: "ndjson" for one object per line, "json" for a JSON array
+        
+    Yields:
+        Encoded chunks of the response body
+    """
+    ndjson = fmt == "ndjson"
+    
+    if not ndjson:
+        yield b"["
+    
+    for start in range(0, len(df), STREAM_CHUNK_ROWS):
+        chunk = df.iloc[start:start + STREAM_CHUNK_ROWS]
+        if ndjson:
+            yield (_to_json(chunk, lines=True).rstrip("\n") + "\n").encode()
+        else:
+            # Drop the chunk's own brackets; the array spans all chunks
+            yield (("," if start else "") + _to_json(chunk)[1:-1]).encode()
+    
+    if not ndjson:
+        yield b"]"
+
+
+async def _data_version(storage) -> tuple:
+    """Get the storage's data version (a cheap fingerprint of its contents)."""
+    if settings.use_postgres:
+        return await storage.get_version()
+    return storage.get_version()
+
+
+def _etag(*parts) -> str:
+    """Build a weak ETag from the given parts.
+    
+    Weak because GZipMiddleware serves the same tag for the gzip and
+    identity encodings, which are not byte-identical representations.
+    """
+    key = ":".join(str(p) for p in parts).encode()
+    return f'W/"{hashlib.blake2s(key, digest_size=8).hexdigest()}"'
+
+
+def _cache_headers(etag: str) -> dict:
+    """Conditional caching headers for a response with the given ETag."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the representation for etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison: W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") in (opaque, "*")
+        for tag in if_none_match.split(",")
+    )
 
 
 @router.get(
@@ -44,13 +158,12 @@ async def get_cds_data(
         description="Maximum number of records to return",
         ge=1,
         le=10000
-    )
+    ),
+    storage=Depends(get_storage),
 ) -> List[CDSRecord]:
     """Get CDS data with optional filtering."""
     try:
-        storage = get_storage()
-        
-        if isinstance(storage, PostgresStorage):
+        if settings.use_postgres:
             df = await storage.get_data(start_date=start_date, end_date=end_date, limit=limit)
         else:
             df = storage.get_data(start_date=start_date, end_date=end_date)
@@ -63,11 +176,7 @@ async def get_cds_data(
                 detail="No CDS data found for the specified criteria"
             )
         
-        # Convert to list of dicts
-        records = df.to_dict(orient="records")
-        
-        # Convert to Pydantic models
-        return [CDSRecord(**record) for record in records]
+        return _records_response(df)
         
     except HTTPException:
         raise
@@ -78,6 +187,73 @@ async def get_cds_data(
         )
 
 
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "application/json": {}},
+            "description": "CDS records, one JSON object per line (ndjson) or a JSON array",
+        },
+        404: {"model": ErrorResponse, "description": "No data found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    },
+    summary="Stream CDS data",
+    description="Stream Brazilian CDS historical data as NDJSON or a chunked JSON array"
+)
+async def stream_cds_data(
+    start_date: Optional[str] = Query(
+        None,
+        description="Start date in YYYY-MM-DD format",
+        example="2025-01-01"
+    ),
+    end_date: Optional[str] = Query(
+        None,
+        description="End date in YYYY-MM-DD format",
+        example="2025-11-07"
+    ),
+    limit: Optional[int] = Query(
+        None,
+        description="Maximum number of records to return",
+        ge=1
+    ),
+    format: Literal["ndjson", "json"] = Query(
+        "ndjson",
+        description="Output format: ndjson (one record per line) or json (array)"
+    ),
+    storage=Depends(get_storage),
+):
+    """Stream CDS data with optional filtering.
+    
+    Same filters as GET /cds/, but the body is written in chunks so the
+    first bytes go out before the whole result has been serialized.
+    """
+    try:
+        if settings.use_postgres:
+            df = await storage.get_data(start_date=start_date, end_date=end_date, limit=limit)
+        else:
+            df = storage.get_data(start_date=start_date, end_date=end_date)
+            if limit:
+                df = df.tail(limit)
+        
+        if df.empty:
+            raise HTTPException(
+                status_code=404,
+                detail="No CDS data found for the specified criteria"
+            )
+        
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+        return StreamingResponse(_iter_records(df, format), media_type=media_type)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error streaming CDS data: {str(e)}"
+        )
+
+
 @router.get(
     "/latest",
     response_model=List[CDSRecord],
@@ -89,19 +265,26 @@ async def get_cds_data(
     description="Retrieve the most recent N CDS records"
 )
 async def get_latest_cds_data(
+    request: Request,
     n: int = Query(
         10,
         description="Number of latest records to return",
         ge=1,
         le=1000
-    )
+    ),
+    storage=Depends(get_storage),
 ) -> List[CDSRecord]:
     """Get the latest N CDS records."""
     try:
-        storage = get_storage()
+        version = await _data_version(storage)
+        etag = _etag(*version, n)
+        if _is_not_modified(request, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
         
-        if isinstance(storage, PostgresStorage):
-            df = await storage.get_data(limit=n)
+        if settings.use_postgres:
+            # Same version as the ETag, so a cached body is only reused
+            # when it matches the tag sent with it
+            df = await storage.get_latest(n=n, version=version)
         else:
             df = storage.get_latest(n=n)
         
@@ -111,11 +294,7 @@ async def get_latest_cds_data(
                 detail="No CDS data available"
             )
         
-        # Convert to list of dicts
-        records = df.to_dict(orient="records")
-        
-        # Convert to Pydantic models
-        return [CDSRecord(**record) for record in records]
+        return _records_response(df, headers=_cache_headers(etag))
         
     except HTTPException:
         raise
@@ -135,17 +314,28 @@ async def get_latest_cds_data(
     summary="Get CDS data statistics",
     description="Retrieve statistics about the stored CDS data"
 )
-async def get_cds_stats() -> CDSStatsResponse:
+async def get_cds_stats(
+    request: Request,
+    storage=Depends(get_storage),
+) -> CDSStatsResponse:
     """Get statistics about the CDS data."""
     try:
-        storage = get_storage()
+        etag = _etag(*await _data_version(storage))
+        if _is_not_modified(request, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
         
-        if isinstance(storage, PostgresStorage):
+        if settings.use_postgres:
             stats = await storage.get_stats()
         else:
             stats = storage.get_stats()
         
-        return CDSStatsResponse(**stats)
+        # Storage already returns the right types: skip validation and let
+        # pydantic-core serialize the model directly
+        return Response(
+            content=CDSStatsResponse.model_construct(**stats).model_dump_json(),
+            media_type="application/json",
+            headers=_cache_headers(etag),
+        )
         
     except Exception as e:
         raise HTTPException(
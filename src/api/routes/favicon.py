@@ -1,15 +1,9 @@
 """Favicon endpoint."""
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Request, Response
 
 router = APIRouter(tags=["Static"])
 
-
-@router.get("/favicon.ico", include_in_schema=False)
-async def favicon():
-    """
-    Serve a favicon as SVG.
-    """
-    svg_content = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+FAVICON_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
         <defs>
             <linearGradient id="grad" x1="0%" y1="0%" x2="100%" y2="100%">
                 <stop offset="0%" style="stop-color:#667eea;stop-opacity:1" />
@@ -23,5 +17,30 @@ async def favicon():
         <path d="M 30 70 Q 50 85 70 70" stroke="#ed8936" stroke-width="5" fill="none" stroke-linecap="round" opacity="0.9"/>
         <text x="50" y="90" font-size="12" text-anchor="middle" fill="white" font-weight="bold">BR</text>
     </svg>"""
-    
-    return Response(content=svg_content, media_type="image/svg+xml")
+
+# Bump the ETag whenever the SVG above changes
+FAVICON_ETAG = '"cds-fav-v1"'
+
+_FAVICON_BYTES = FAVICON_SVG.encode("utf-8")
+_FAVICON_HEADERS = {
+    "Cache-Control": "public, max-age=86400, immutable",
+    "ETag": FAVICON_ETAG,
+}
+
+
+@router.get("/favicon.ico", include_in_schema=False)
+async def favicon(request: Request):
+    """
+    Serve a favicon as SVG.
+
+    The icon is encoded once at import time and cached by browsers; requests
+    revalidating with a matching ETag get an empty 304.
+    """
+    if request.headers.get("if-none-match") == FAVICON_ETAG:
+        return Response(status_code=304, headers=_FAVICON_HEADERS)
+
+    return Response(
+        content=_FAVICON_BYTES,
+        media_type="image/svg+xml",
+        headers=_FAVICON_HEADERS,
+    )
@@ -5,6 +5,7 @@ from src.database.connection import (
     get_db_session,
     get_database_url,
     init_db,
+    table_exists,
 )
 from src.database.models import Base, CDSData
 
@@ -16,4 +17,5 @@ __all__ = [
     "get_db_session",
     "get_database_url",
     "init_db",
+    "table_exists",
 ]
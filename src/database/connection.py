@@ -3,6 +3,7 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
@@ -24,11 +25,12 @@ def get_database_url() -> str:
         Database URL string
     """
     # Vercel provides POSTGRES_URL for Neon
-    db_url = os.getenv("POSTGRES_URL") or os.getenv("DATABASE_URL")
+    db_url = os.getenv("POSTGRES_URL") or os.getenv("DATABASE_URL") or settings.DATABASE_URL
     
     if not db_url:
         raise ValueError(
-            "Database URL not found. Set POSTGRES_URL or DATABASE_URL environment variable."
+            "Database URL not found. Set POSTGRES_URL, DATABASE_URL or "
+            "NEON_DATABASE_URL environment variable."
         )
     
     # Convert postgres:// to postgresql+asyncpg://
@@ -50,12 +52,28 @@ def init_db():
     try:
         db_url = get_database_url()
         
+        connect_args = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        }
+        if settings.DB_TCP_KEEPALIVES:
+            # Server-side TCP keepalives so idle pooled connections are kept
+            # alive (or detected as dead) instead of silently dropped
+            connect_args["server_settings"] = {
+                "tcp_keepalives_idle": "60",
+                "tcp_keepalives_interval": "10",
+                "tcp_keepalives_count": "5",
+            }
+        
         engine = create_async_engine(
             db_url,
             echo=settings.LOG_LEVEL == "DEBUG",
-            pool_size=5,
-            max_overflow=10,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
             pool_pre_ping=True,
+            # Replace connections before NAT/proxy idle timeouts cut them
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            connect_args=connect_args,
         )
         
         async_session_maker = async_sessionmaker(
@@ -84,6 +102,27 @@ async def create_tables():
         raise
 
 
+async def table_exists(table_name: str) -> bool:
+    """Check whether a table exists in the public schema.
+    
+    A single catalog lookup, used instead of running DDL on every start.
+    
+    Args:
+        table_name: Name of the table to look up
+        
+    Returns:
+        True if the table exists
+    """
+    if engine is None:
+        init_db()
+    
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT to_regclass(:name)"), {"name": f"public.{table_name}"}
+        )
+        return result.scalar() is not None
+
+
 async def drop_tables():
     """Drop all database tables. Use with caution!"""
     if engine is None:
@@ -1,9 +1,8 @@
 """SQLAlchemy database models for Brazilian CDS data."""
 from datetime import datetime
-from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Column, Date, DateTime, Index, Numeric, func
+from sqlalchemy import Column, Date, DateTime, Double, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -18,13 +17,13 @@ class CDSData(Base):
     date = Column(Date, primary_key=True, nullable=False)
     
     # OHLC data
-    open = Column(Numeric(10, 4), nullable=True)
-    high = Column(Numeric(10, 4), nullable=True)
-    low = Column(Numeric(10, 4), nullable=True)
-    close = Column(Numeric(10, 4), nullable=False)
+    open = Column(Double, nullable=True)
+    high = Column(Double, nullable=True)
+    low = Column(Double, nullable=True)
+    close = Column(Double, nullable=False)
     
     # Additional data
-    change_pct = Column(Numeric(10, 4), nullable=True)
+    change_pct = Column(Double, nullable=True)
     
     # Metadata
     created_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -48,9 +47,9 @@ class CDSData(Base):
         """Convert to dictionary."""
         return {
             "date": self.date.isoformat() if self.date else None,
-            "open": float(self.open) if self.open is not None else None,
-            "high": float(self.high) if self.high is not None else None,
-            "low": float(self.low) if self.low is not None else None,
-            "close": float(self.close) if self.close is not None else None,
-            "change_pct": float(self.change_pct) if self.change_pct is not None else None,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "change_pct": self.change_pct,
         }
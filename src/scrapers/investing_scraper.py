@@ -5,6 +5,7 @@ from typing import Optional
 
 import pandas as pd
 import requests
+from lxml import etree
 from lxml import html as lxhtml
 from requests.adapters import HTTPAdapter, Retry
 
@@ -13,6 +14,31 @@ from src.utils import get_logger
 
 logger = get_logger()
 
+# Column classifier for Investing.com headers: (required substrings,
+# canonical name), checked in order, first match wins
+_COL_RULES = (
+    (("data",), "date"), (("date",), "date"),
+    (("abert",), "open"), (("open",), "open"),
+    (("máxima",), "high"), (("maxima",), "high"), (("high",), "high"),
+    (("mínima",), "low"), (("minima",), "low"), (("low",), "low"),
+    (("último",), "close"), (("ultimo",), "close"), (("close",), "close"),
+    (("price",), "close"), (("fech",), "close"),
+    (("var", "%"), "change_pct"),
+)
+
+# First signed number in a change-percent cell (parser fallback)
+_CHANGE_PCT_RE = re.compile(r"([+-]?\d+(?:\.\d+)?)")
+
+# XPath expressions compiled once instead of on every parse
+_TABLE_XPATH = etree.XPath(settings.TABLE_XPATH)
+_HEAD_XPATH = etree.XPath(".//thead//th")
+_ROW_XPATH = etree.XPath(".//tbody//tr")
+_CELL_XPATH = etree.XPath("./td")
+
+# Shared HTTP session (created on first use) so repeated fetches reuse the
+# pooled keep-alive connection instead of a new TCP/TLS handshake each time
+_SESSION: Optional[requests.Session] = None
+
 
 def _clean_number(s: str) -> Optional[float]:
     """Clean and convert string to float.
@@ -61,7 +87,7 @@ def _parse_change_pct(s: str) -> Optional[float]:
         return float(s)
     except ValueError:
         # tenta capturar algo como "+1.56%" já sem %, mas com unicode
-        m = re.search(r"([+-]?\d+(?:\.\d+)?)", s)
+        m = _CHANGE_PCT_RE.search(s)
         if m:
             try:
                 return float(m.group(1))
@@ -70,6 +96,47 @@ def _parse_change_pct(s: str) -> Optional[float]:
         return None
 
 
+def _clean_number_series(s: pd.Series) -> pd.Series:
+    """Vectorized equivalent of _clean_number for a whole column.
+    
+    Args:
+        s: Series of raw values
+        
+    Returns:
+        Float Series divided by 100, NaN where conversion fails
+    """
+    t = s.astype(str).str.strip()
+    t = t.mask(t.str.lower().isin(["", "nan", "none", "null", "-"]))
+    t = (
+        t.str.replace(".", "", regex=False)  # "1.234,56" -> "1234,56"
+        .str.replace(",", ".", regex=False)
+        .str.replace("%", "", regex=False)
+    )
+    return pd.to_numeric(t, errors="coerce") / 100
+
+
+def _parse_change_pct_series(s: pd.Series) -> pd.Series:
+    """Vectorized equivalent of _parse_change_pct for a whole column.
+    
+    Args:
+        s: Series of raw values
+        
+    Returns:
+        Float Series of percentages, NaN where parsing fails
+    """
+    t = (
+        s.astype(str)
+        .str.strip()
+        .str.replace(" ", "", regex=False)
+        .str.replace("%", "", regex=False)
+        .str.replace(",", ".", regex=False)
+    )
+    values = pd.to_numeric(t, errors="coerce")
+    # mesmo fallback do parser escalar: primeiro número encontrado no texto
+    fallback = pd.to_numeric(t.str.extract(_CHANGE_PCT_RE, expand=False), errors="coerce")
+    return values.fillna(fallback)
+
+
 def _requests_session_with_retries(
     total: Optional[int] = None,
     backoff_factor: Optional[float] = None
@@ -100,6 +167,18 @@ def _requests_session_with_retries(
     return s
 
 
+def _get_session() -> requests.Session:
+    """Get the shared requests session, creating it on first use.
+    
+    Returns:
+        Configured requests Session
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _requests_session_with_retries()
+    return _SESSION
+
+
 def fetch_html(url: str) -> str:
     """Fetch HTML content from URL.
     
@@ -112,7 +191,7 @@ def fetch_html(url: str) -> str:
     Raises:
         requests.HTTPError: If request fails
     """
-    session = _requests_session_with_retries()
+    session = _get_session()
     r = session.get(url, headers=settings.request_headers, timeout=settings.REQUEST_TIMEOUT)
     r.raise_for_status()
     return r.text
@@ -129,63 +208,41 @@ def _normalize_investing_table(df_raw: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Normalized DataFrame with date, open, high, low, close, change_pct columns
     """
-    df = df_raw.copy()
-    # normaliza nomes de coluna
-    lower_cols = {c: str(c).strip().lower() for c in df.columns}
-    df.rename(columns=lower_cols, inplace=True)
-
-    # mapeia colunas esperadas
+    # mapeia colunas esperadas a partir dos nomes normalizados
     # em pt: data, último, abertura, máxima, mínima, var%
     # em en pode vir: date, price/last, open, high, low, change %
-    col_map = {}
-    for c in df.columns:
-        cl = c.lower()
-        if "data" in cl or "date" in cl:
-            col_map[c] = "date"
-        elif "abert" in cl or "open" in cl:
-            col_map[c] = "open"
-        elif "máxima" in cl or "maxima" in cl or "high" in cl:
-            col_map[c] = "high"
-        elif "mínima" in cl or "minima" in cl or "low" in cl:
-            col_map[c] = "low"
-        elif "último" in cl or "ultimo" in cl or "close" in cl or "price" in cl or "fech" in cl:
-            col_map[c] = "close"
-        elif "var" in cl and "%" in cl:
-            col_map[c] = "change_pct"
-
-    df.rename(columns=col_map, inplace=True)
+    sources = {}
+    for c in df_raw.columns:
+        cl = str(c).strip().lower()
+        canonical = next((name for subs, name in _COL_RULES if all(sub in cl for sub in subs)), None)
+        if canonical:
+            sources.setdefault(canonical, c)
 
     expected = ["date", "open", "high", "low", "close", "change_pct"]
-    # mantém apenas as que temos
-    keep = [c for c in expected if c in df.columns]
-    df = df[keep].copy()
+    # mantém apenas as que temos, já na ordem OHLC, com uma única seleção
+    keep = [c for c in expected if c in sources]
+    df = df_raw.loc[:, [sources[c] for c in keep]]
+    df.columns = keep
 
     # converte tipos
     # datas vêm em "dd.mm.yyyy" no HTML (e podem vir "dd/mm/yyyy" em outras versões)
     df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True, format=None)
     if "close" in df.columns:
-        df["close"] = df["close"].apply(_clean_number)
+        df["close"] = _clean_number_series(df["close"])
     if "open" in df.columns:
-        df["open"] = df["open"].apply(_clean_number)
+        df["open"] = _clean_number_series(df["open"])
     if "high" in df.columns:
-        df["high"] = df["high"].apply(_clean_number)
+        df["high"] = _clean_number_series(df["high"])
     if "low" in df.columns:
-        df["low"] = df["low"].apply(_clean_number)
+        df["low"] = _clean_number_series(df["low"])
     if "change_pct" in df.columns:
-        df["change_pct"] = df["change_pct"].apply(_parse_change_pct)
-
-    # ordena colunas para formato OHLC
-    col_order = ['date', 'open', 'high', 'low', 'close', 'change_pct']
-    df = df[[c for c in col_order if c in df.columns]]
+        df["change_pct"] = _parse_change_pct_series(df["change_pct"])
 
     # remove linhas sem data ou sem preço
-    df = df.dropna(subset=["date"])
-    if "close" in df.columns:
-        df = df.dropna(subset=["close"])
+    df = df.dropna(subset=[c for c in ("date", "close") if c in df.columns])
 
     # ordena do mais antigo para o mais recente (facilita merges)
-    df = df.sort_values("date").reset_index(drop=True)
-    return df
+    return df.sort_values("date", ignore_index=True)
 
 
 def parse_table_with_read_html(page_html: str) -> Optional[pd.DataFrame]:
@@ -213,9 +270,8 @@ def parse_table_with_read_html(page_html: str) -> Optional[pd.DataFrame]:
     if not candidates:
         return None
 
-    # Pega a primeira candidata
-    df = candidates[0].copy()
-    return _normalize_investing_table(df)
+    # Pega a primeira candidata (a normalização não altera o original)
+    return _normalize_investing_table(candidates[0])
 
 
 def parse_table_with_xpath(page_html: str) -> Optional[pd.DataFrame]:
@@ -231,16 +287,16 @@ def parse_table_with_xpath(page_html: str) -> Optional[pd.DataFrame]:
     """
     try:
         root = lxhtml.fromstring(page_html)
-        tables = root.xpath(settings.TABLE_XPATH)
+        tables = _TABLE_XPATH(root)
         if not tables:
             return None
         table_el = tables[0]
 
         # Extrai cabeçalhos
-        headers = [("".join(th.itertext())).strip() for th in table_el.xpath(".//thead//th")]
+        headers = [th.text_content().strip() for th in _HEAD_XPATH(table_el)]
         rows = []
-        for tr in table_el.xpath(".//tbody//tr"):
-            cells = [("".join(td.itertext())).strip() for td in tr.xpath("./td")]
+        for tr in _ROW_XPATH(table_el):
+            cells = [td.text_content().strip() for td in _CELL_XPATH(tr)]
             if cells:
                 rows.append(cells)
         if not headers or not rows:
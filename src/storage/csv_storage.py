@@ -2,8 +2,9 @@
 import os
 import shutil
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import pandas as pd
 
@@ -12,6 +13,37 @@ from src.utils import get_logger
 
 logger = get_logger()
 
+# Parquet companion file support (optional: pip install .[parquet])
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
+# Parquet schema metadata key holding the "<mtime_ns>:<size>" of the CSV the
+# companion was built from
+PARQUET_SOURCE_KEY = b"cds_source_csv"
+
+# Column types for parsing the CSV (dates are parsed separately)
+CSV_DTYPES = {
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "change_pct": "float64",
+}
+
+
+@lru_cache(maxsize=4)
+def _load_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Parse a data file once per (path, mtime, size) for the whole process.
+    
+    A rewritten file gets a new key, so stale versions simply age out.
+    The returned DataFrame is shared and must not be mutated.
+    """
+    return CDSStorage(Path(path))._read()
+
 
 class CDSStorage:
     """Handle CSV storage operations for CDS data."""
@@ -22,26 +54,121 @@ class CDSStorage:
         Args:
             csv_path: Path to CSV file. Uses settings default if not provided.
         """
-        self.csv_path = csv_path or settings.CSV_OUTPUT_PATH
+        self.csv_path = csv_path or settings.csv_data_path
+        # Columnar copy of the CSV, written alongside it when pyarrow is
+        # installed; the CSV stays the source of truth and export format
+        self.parquet_path = Path(self.csv_path).with_suffix(".parquet")
+    
+    def _csv_signature(self) -> bytes:
+        """Encode the CSV's (mtime, size) for the Parquet schema metadata."""
+        return "{}:{}".format(*self.get_version()).encode()
+    
+    def _parquet_is_fresh(self) -> bool:
+        """Check whether the Parquet companion was built from the current CSV.
         
-    def load_existing_data(self) -> pd.DataFrame:
-        """Load existing CSV data if available.
+        Compares the CSV (mtime, size) recorded in the companion's metadata
+        with the file on disk for an exact match, so a CSV that goes back in
+        time (restored from a backup, copied with ``cp -p``, rolled back by a
+        deploy) is not shadowed by a newer-looking companion.
+        """
+        if not _HAS_PARQUET:
+            return False
+        try:
+            metadata = pq.read_schema(self.parquet_path).metadata or {}
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return False
+        return metadata.get(PARQUET_SOURCE_KEY) == self._csv_signature()
+    
+    def _write_parquet(self, df: pd.DataFrame) -> None:
+        """Write the Parquet companion, ignoring failures (it is only a cache).
+        
+        Must be called after the CSV it mirrors has been written: the CSV's
+        current (mtime, size) is stored with it.
+        """
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                PARQUET_SOURCE_KEY: self._csv_signature(),
+            })
+            tmp_path = self.parquet_path.with_suffix(".parquet.tmp")
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, self.parquet_path)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar Parquet {self.parquet_path}: {e}")
+    
+    def build_parquet(self) -> bool:
+        """Rebuild the Parquet companion from the current CSV.
+        
+        Used by the maintenance scripts; the API only reads the companion.
         
         Returns:
-            DataFrame with existing data or empty DataFrame with correct columns
+            True if a companion was written, False if pyarrow or the CSV is missing
+        """
+        if not _HAS_PARQUET or not os.path.exists(self.csv_path):
+            return False
+        self._write_parquet(self._read_csv())
+        return True
+    
+    def _read(self) -> pd.DataFrame:
+        """Load the stored data, preferring the Parquet companion when it is current.
+        
+        Parquet is read column-wise with types preserved, so no text parsing is
+        needed. A missing or stale companion falls back to the CSV; it is never
+        rebuilt here, so concurrent reads don't write to disk (save_data and
+        the scripts keep it up to date).
         """
+        if os.path.exists(self.csv_path) and self._parquet_is_fresh():
+            df = pd.read_parquet(self.parquet_path)
+            logger.info(f"Carregados {len(df)} registros de {self.parquet_path}")
+            return df
+        
+        return self._read_csv()
+    
+    def _read_csv(self) -> pd.DataFrame:
+        """Parse the CSV file from disk."""
         if not os.path.exists(self.csv_path):
             logger.warning(f"CSV inexistente em {self.csv_path}; iniciando base vazia.")
             return pd.DataFrame(columns=["date", "open", "high", "low", "close", "change_pct"])
         
-        df = pd.read_csv(self.csv_path)
-        # normaliza
-        if "date" in df.columns:
+        # Typed parse with the C engine: no per-column type inference, and
+        # dates are parsed with the fixed format save_data writes
+        df = pd.read_csv(
+            self.csv_path,
+            engine="c",
+            dtype=CSV_DTYPES,
+            parse_dates=["date"],
+            date_format="%Y-%m-%d",
+        )
+        # normaliza (a malformed date leaves the column as text)
+        if not pd.api.types.is_datetime64_any_dtype(df["date"]):
             df["date"] = pd.to_datetime(df["date"], errors="coerce")
         
         logger.info(f"Carregados {len(df)} registros de {self.csv_path}")
         return df
     
+    def _snapshot(self) -> pd.DataFrame:
+        """Get the parsed CSV, re-reading the file only when it has changed.
+        
+        The returned DataFrame is shared across calls and must not be mutated.
+        
+        Returns:
+            Cached DataFrame for the current file version
+        """
+        return _load_cached(str(self.csv_path), *self.get_version())
+    
+    def preload(self) -> None:
+        """Parse the CSV into the in-process cache ahead of the first read."""
+        self._snapshot()
+        
+    def load_existing_data(self) -> pd.DataFrame:
+        """Load existing CSV data if available.
+        
+        Returns:
+            DataFrame with existing data or empty DataFrame with correct columns
+        """
+        return self._snapshot().copy()
+    
     def merge_and_dedup(self, old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
         """Merge old and new data, removing duplicates.
         
@@ -52,14 +179,28 @@ class CDSStorage:
         Returns:
             Merged DataFrame without duplicates, sorted by date
         """
+        # remove duplicatas por data (mantém a última ocorrência); só o lote
+        # novo, que é pequeno, passa por drop_duplicates
+        new = new.drop_duplicates(subset=["date"], keep="last")
         if old is None or old.empty:
-            merged = new.copy()
+            merged = new
         else:
-            merged = pd.concat([old, new], ignore_index=True)
+            # datas do histórico que o lote novo substitui saem com um isin
+            # (hash, O(n)) em vez de deduplicar o conjunto inteiro
+            dates = old["date"]
+            stale = dates.isin(new["date"])
+            # histórico estritamente crescente não tem duplicatas próprias
+            values = dates.to_numpy()
+            if not (values[1:] > values[:-1]).all():
+                stale |= dates.duplicated(keep="last")
+            merged = pd.concat([old[~stale], new], ignore_index=True)
         
-        # remove duplicatas por data (mantém a última ocorrência)
-        merged = merged.drop_duplicates(subset=["date"], keep="last")
-        merged = merged.sort_values("date").reset_index(drop=True)
+        # o histórico já vem ordenado e o lote novo costuma ser mais recente,
+        # então a ordenação quase sempre é dispensada
+        if not merged["date"].is_monotonic_increasing:
+            merged = merged.sort_values("date", ignore_index=True)
+        else:
+            merged = merged.reset_index(drop=True)
         
         logger.info(f"Após merge e dedup: {len(merged)} registros totais")
         return merged
@@ -77,7 +218,12 @@ class CDSStorage:
         backup_path = self.csv_path.parent / f"{self.csv_path.stem}__bkp_{ts}.csv"
         
         try:
-            shutil.copy2(self.csv_path, backup_path)
+            # Hardlink: no bytes copied. Safe because save_data never writes
+            # into the existing file, it replaces it with a new one
+            try:
+                os.link(self.csv_path, backup_path)
+            except OSError:
+                shutil.copy2(self.csv_path, backup_path)
             logger.info(f"Backup criado: {backup_path}")
             return str(backup_path)
         except Exception as e:
@@ -102,8 +248,13 @@ class CDSStorage:
         if create_backup:
             self.create_backup()
         
-        # Salva
-        df.to_csv(self.csv_path, index=False, date_format="%Y-%m-%d")
+        # Salva num arquivo temporário e publica com rename atômico: leitores
+        # nunca veem um CSV pela metade e o backup (hardlink) fica intacto
+        tmp_path = self.csv_path.with_suffix(".csv.tmp")
+        df.to_csv(tmp_path, index=False, date_format="%Y-%m-%d")
+        os.replace(tmp_path, self.csv_path)
+        if _HAS_PARQUET:
+            self._write_parquet(df)
         logger.success(f"Dados salvos: {self.csv_path} ({len(df)} linhas)")
     
     def update_from_scraper(self, new_data: pd.DataFrame) -> pd.DataFrame:
@@ -134,17 +285,22 @@ class CDSStorage:
         Returns:
             Filtered DataFrame
         """
-        df = self.load_existing_data()
+        df = self._snapshot()
         
-        if start_date:
-            start = pd.to_datetime(start_date)
-            df = df[df["date"] >= start]
+        if not (start_date or end_date):
+            return df.copy()
         
-        if end_date:
-            end = pd.to_datetime(end_date)
-            df = df[df["date"] <= end]
+        # Saved data is sorted by date, so the range can be found by binary
+        # search instead of building boolean masks over every row
+        dates = df["date"]
+        if not dates.is_monotonic_increasing:
+            df = df.dropna(subset=["date"]).sort_values("date", ignore_index=True)
+            dates = df["date"]
         
-        return df
+        lo = dates.searchsorted(pd.to_datetime(start_date), side="left") if start_date else 0
+        hi = dates.searchsorted(pd.to_datetime(end_date), side="right") if end_date else len(df)
+        
+        return df.iloc[lo:hi].copy()
     
     def get_latest(self, n: int = 10) -> pd.DataFrame:
         """Get the latest N records.
@@ -155,8 +311,20 @@ class CDSStorage:
         Returns:
             DataFrame with latest n records
         """
-        df = self.load_existing_data()
-        return df.tail(n)
+        return self._snapshot().tail(n).copy()
+    
+    def get_version(self) -> Tuple[int, int]:
+        """Get a cheap fingerprint of the stored data without parsing the file.
+        
+        Returns:
+            Tuple of (modification time in ns, size in bytes), or (0, 0) if
+            the CSV does not exist
+        """
+        try:
+            st = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return (0, 0)
+        return (st.st_mtime_ns, st.st_size)
     
     def get_stats(self) -> dict:
         """Get basic statistics about the stored data.
@@ -164,7 +332,7 @@ class CDSStorage:
         Returns:
             Dictionary with stats (count, date_range, etc.)
         """
-        df = self.load_existing_data()
+        df = self._snapshot()
         
         if df.empty:
             return {
@@ -174,13 +342,22 @@ class CDSStorage:
                 "oldest_date": None,
             }
         
+        # Saved data is sorted, so the range ends are the first and last rows
+        dates = df["date"]
+        if dates.is_monotonic_increasing:
+            oldest, latest = dates.iloc[0], dates.iloc[-1]
+        else:
+            oldest, latest = dates.min(), dates.max()
+        oldest = oldest.strftime("%Y-%m-%d")
+        latest = latest.strftime("%Y-%m-%d")
+        
         return {
             "total_records": len(df),
             "date_range": {
-                "start": df["date"].min().strftime("%Y-%m-%d"),
-                "end": df["date"].max().strftime("%Y-%m-%d"),
+                "start": oldest,
+                "end": latest,
             },
-            "latest_date": df["date"].max().strftime("%Y-%m-%d"),
-            "oldest_date": df["date"].min().strftime("%Y-%m-%d"),
-            "latest_close": float(df.iloc[-1]["close"]) if "close" in df.columns else None,
+            "latest_date": latest,
+            "oldest_date": oldest,
+            "latest_close": float(df["close"].iloc[-1]) if "close" in df.columns else None,
         }
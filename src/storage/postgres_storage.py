@@ -1,20 +1,128 @@
 """PostgreSQL storage module for Brazilian CDS data."""
+import time
+from collections import OrderedDict
 from datetime import date, datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from sqlalchemy import delete, desc, func, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from src.database import CDSData, get_db_session
 from src.utils import get_logger
 
 logger = get_logger()
 
+# Distinct get_data() queries kept in the result cache
+DATA_CACHE_MAX_ENTRIES = 32
+
+# Rows sent per executemany call in upsert_data
+UPSERT_BATCH_SIZE = 1000
+
+# Minimum rows for upsert_data to load an empty table with COPY
+COPY_MIN_ROWS = 1000
+
+# Numeric columns of cds_data, in table order
+VALUE_COLUMNS = ["open", "high", "low", "close", "change_pct"]
+
+
+async def _driver_connection(session: AsyncSession):
+    """Get the underlying asyncpg connection bound to a session.
+
+    Needed for driver-level features SQLAlchemy does not expose, such as COPY.
+
+    Args:
+        session: Active database session
+
+    Returns:
+        asyncpg Connection instance
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+def _data_columns() -> tuple:
+    """Core column expressions selected by the read queries, in frame order."""
+    return (CDSData.date, *(getattr(CDSData, c) for c in VALUE_COLUMNS))
+
+
+def _rows_to_frame(rows) -> pd.DataFrame:
+    """Build a CDS DataFrame from plain result rows.
+    
+    Args:
+        rows: Tuples of (date, open, high, low, close, change_pct)
+        
+    Returns:
+        DataFrame with datetime dates and float values
+    """
+    df = pd.DataFrame.from_records(rows, columns=["date", *VALUE_COLUMNS])
+    df["date"] = pd.to_datetime(df["date"])
+    # NULLs become NaN
+    df[VALUE_COLUMNS] = df[VALUE_COLUMNS].astype(float)
+    return df
+
+
+def _to_records(df: pd.DataFrame) -> List[Dict]:
+    """Convert a CDS DataFrame to database parameter dicts, column-wise.
+    
+    Dates become ``datetime.date``, values become Python floats and missing
+    values (or absent optional columns) become None.
+    
+    Args:
+        df: DataFrame with CDS data
+        
+    Returns:
+        List of dicts keyed by column name
+    """
+    values = df.reindex(columns=VALUE_COLUMNS).astype(float)
+    dates = pd.to_datetime(df["date"]).dt.date.to_numpy()
+    return (
+        values.astype(object)
+        .where(values.notna(), None)
+        .assign(date=dates)
+        .to_dict(orient="records")
+    )
+
 
 class PostgresStorage:
     """Handle PostgreSQL storage operations for CDS data."""
     
+    # get_data() results keyed by (start_date, end_date, limit), shared by
+    # all instances: key -> (expires_at, data version, DataFrame). An entry is
+    # only served while get_version() still matches, so rows written by
+    # another process (the scraper) are picked up on the next request.
+    _data_cache: "OrderedDict[Tuple, Tuple[float, Tuple, pd.DataFrame]]" = OrderedDict()
+    
+    @classmethod
+    def _cache_get(cls, key: Tuple, version: Tuple) -> Optional[pd.DataFrame]:
+        """Get a cached query result if it matches the current data version."""
+        entry = cls._data_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, cached_version, df = entry
+        if cached_version != version or expires_at < time.monotonic():
+            del cls._data_cache[key]
+            return None
+        cls._data_cache.move_to_end(key)
+        return df
+    
+    @classmethod
+    def _cache_put(cls, key: Tuple, version: Tuple, df: pd.DataFrame) -> None:
+        """Store a query result, evicting the least recently used entries."""
+        cls._data_cache[key] = (time.monotonic() + settings.DATA_CACHE_TTL, version, df)
+        cls._data_cache.move_to_end(key)
+        while len(cls._data_cache) > DATA_CACHE_MAX_ENTRIES:
+            cls._data_cache.popitem(last=False)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop cached query results (called after every write)."""
+        cls._data_cache.clear()
+    
     async def load_existing_data(self) -> pd.DataFrame:
         """Load all CDS data from database.
         
@@ -22,17 +130,15 @@ class PostgresStorage:
             DataFrame with all data sorted by date
         """
         async with get_db_session() as session:
-            query = select(CDSData).order_by(CDSData.date)
+            query = select(*_data_columns()).order_by(CDSData.date)
             result = await session.execute(query)
-            records = result.scalars().all()
+            rows = result.all()
             
-            if not records:
+            if not rows:
                 logger.warning("No data found in database")
                 return pd.DataFrame(columns=["date", "open", "high", "low", "close", "change_pct"])
             
-            data = [record.to_dict() for record in records]
-            df = pd.DataFrame(data)
-            df["date"] = pd.to_datetime(df["date"])
+            df = _rows_to_frame(rows)
             
             logger.info(f"Loaded {len(df)} records from database")
             return df
@@ -40,7 +146,9 @@ class PostgresStorage:
     async def upsert_data(self, df: pd.DataFrame) -> int:
         """Insert or update CDS data in database.
         
-        Uses PostgreSQL's ON CONFLICT to handle duplicates.
+        Uses PostgreSQL's ON CONFLICT to handle duplicates. Large loads into
+        an empty table (the initial backfill) use COPY instead, since there
+        is nothing to conflict with.
         
         Args:
             df: DataFrame with CDS data
@@ -53,21 +161,23 @@ class PostgresStorage:
             return 0
         
         # Convert DataFrame to list of dicts
-        records = []
-        for _, row in df.iterrows():
-            record = {
-                "date": row["date"].date() if isinstance(row["date"], pd.Timestamp) else row["date"],
-                "open": float(row["open"]) if pd.notna(row.get("open")) else None,
-                "high": float(row["high"]) if pd.notna(row.get("high")) else None,
-                "low": float(row["low"]) if pd.notna(row.get("low")) else None,
-                "close": float(row["close"]) if pd.notna(row["close"]) else None,
-                "change_pct": float(row["change_pct"]) if pd.notna(row.get("change_pct")) else None,
-            }
-            records.append(record)
+        records = _to_records(df)
         
         async with get_db_session() as session:
-            # Use PostgreSQL INSERT ... ON CONFLICT ... DO UPDATE
-            stmt = insert(CDSData).values(records)
+            if len(records) >= COPY_MIN_ROWS and not await self._has_rows(session):
+                count = await self._copy_records(session, records)
+                await session.commit()
+                self.clear_cache()
+                
+                logger.success(f"Copied {count} records to empty table")
+                return count
+            
+            # Use PostgreSQL INSERT ... ON CONFLICT ... DO UPDATE.
+            # Rows are passed as executemany parameters instead of .values(records)
+            # so the SQL text stays constant: it is prepared once per connection
+            # and the driver pipelines the batch instead of parsing one huge
+            # statement per call.
+            stmt = insert(CDSData)
             stmt = stmt.on_conflict_do_update(
                 index_elements=["date"],
                 set_={
@@ -80,30 +190,135 @@ class PostgresStorage:
                 }
             )
             
-            await session.execute(stmt)
+            # Send in fixed-size batches within the session's single
+            # transaction, bounding the parameter buffers held at once
+            for start in range(0, len(records), UPSERT_BATCH_SIZE):
+                await session.execute(stmt, records[start:start + UPSERT_BATCH_SIZE])
             await session.commit()
+            self.clear_cache()
             
             logger.success(f"Upserted {len(records)} records to database")
             return len(records)
+
+    @staticmethod
+    async def _has_rows(session: AsyncSession) -> bool:
+        """Check whether cds_data holds any row (a single index probe)."""
+        result = await session.execute(select(CDSData.date).limit(1))
+        return result.first() is not None
+    
+    @staticmethod
+    async def _copy_records(session: AsyncSession, records: List[Dict]) -> int:
+        """Load records with COPY through the session's connection.
+        
+        Runs in the session's transaction. COPY has no conflict handling, so
+        repeated dates are collapsed first (last one wins, as with the
+        upsert) and the target must not already contain them.
+        
+        Args:
+            session: Active database session
+            records: Dicts as produced by _to_records()
+            
+        Returns:
+            Number of rows copied
+        """
+        columns = ["date", *VALUE_COLUMNS]
+        unique = {record["date"]: record for record in records}
+        rows = [tuple(record[c] for c in columns) for record in unique.values()]
+        
+        conn = await _driver_connection(session)
+        await conn.copy_records_to_table(CDSData.__tablename__, records=rows, columns=columns)
+        return len(rows)
     
+    async def copy_from_csv(self, csv_path: Path, columns: Optional[List[str]] = None) -> int:
+        """Bulk load a CSV file into the database using COPY.
+
+        The file is streamed into a temporary staging table with
+        ``COPY ... FROM STDIN`` and then merged into ``cds_data`` with a single
+        ``INSERT ... ON CONFLICT``, avoiding per-row statement overhead.
+        When a date appears more than once, the last row in the file wins.
+
+        Args:
+            csv_path: Path to a CSV file with a header row
+            columns: Column names in file order. Defaults to the standard
+                CDS columns.
+
+        Returns:
+            Number of records inserted or updated
+        """
+        columns = columns or ["date", "open", "high", "low", "close", "change_pct"]
+        table = CDSData.__tablename__
+
+        async with get_db_session() as session:
+            conn = await _driver_connection(session)
+
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMP TABLE cds_stage (LIKE {table} INCLUDING DEFAULTS) "
+                    "ON COMMIT DROP"
+                )
+                await conn.copy_to_table(
+                    "cds_stage",
+                    source=csv_path,
+                    columns=columns,
+                    format="csv",
+                    header=True,
+                )
+                status = await conn.execute(
+                    f"""
+                    INSERT INTO {table} (date, open, high, low, close, change_pct)
+                    SELECT DISTINCT ON (date) date, open, high, low, close, change_pct
+                    FROM cds_stage
+                    ORDER BY date, ctid DESC
+                    ON CONFLICT (date) DO UPDATE SET
+                        open = EXCLUDED.open,
+                        high = EXCLUDED.high,
+                        low = EXCLUDED.low,
+                        close = EXCLUDED.close,
+                        change_pct = EXCLUDED.change_pct,
+                        updated_at = now()
+                    """
+                )
+
+            self.clear_cache()
+            
+            # Status tag has the form "INSERT 0 <rows>"
+            count = int(status.split()[-1])
+            logger.success(f"Copied {count} records to database from {csv_path}")
+            return count
+
     async def get_data(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        version: Optional[Tuple] = None,
     ) -> pd.DataFrame:
         """Get CDS data with optional filtering.
         
+        Results are cached per query and reused while the data version is
+        unchanged; checking it costs one aggregate query instead of the full
+        select.
+        
         Args:
             start_date: Start date (YYYY-MM-DD format)
             end_date: End date (YYYY-MM-DD format)
             limit: Maximum number of records to return
+            version: Data version from get_version(), if the caller already
+                has it (e.g. for an ETag); fetched when needed otherwise
             
         Returns:
             Filtered DataFrame
         """
+        key = (start_date, end_date, limit)
+        if settings.DATA_CACHE_TTL > 0:
+            if version is None:
+                version = await self.get_version()
+            cached = self._cache_get(key, version)
+            if cached is not None:
+                return cached.copy()
+        
         async with get_db_session() as session:
-            query = select(CDSData).order_by(CDSData.date)
+            query = select(*_data_columns())
             
             # Apply filters
             if start_date:
@@ -115,49 +330,56 @@ class PostgresStorage:
                 query = query.where(CDSData.date <= end)
             
             if limit:
-                # For limit, we want the most recent records
-                query = select(CDSData).order_by(desc(CDSData.date)).limit(limit)
+                # For limit, we want the most recent records within the range
+                query = query.order_by(desc(CDSData.date)).limit(limit)
+            else:
+                query = query.order_by(CDSData.date)
             
             result = await session.execute(query)
-            records = result.scalars().all()
+            rows = result.all()
             
-            if not records:
+            if not rows:
                 return pd.DataFrame(columns=["date", "open", "high", "low", "close", "change_pct"])
             
-            data = [record.to_dict() for record in records]
-            df = pd.DataFrame(data)
-            df["date"] = pd.to_datetime(df["date"])
+            df = _rows_to_frame(rows)
             
             # Sort by date ascending
             df = df.sort_values("date").reset_index(drop=True)
             
+            if settings.DATA_CACHE_TTL > 0:
+                # Tagged with the version read before the query: if rows
+                # changed in between, the entry just misses next time
+                self._cache_put(key, version, df)
+                return df.copy()
             return df
     
-    async def get_latest(self, n: int = 10) -> pd.DataFrame:
+    async def get_latest(self, n: int = 10, version: Optional[Tuple] = None) -> pd.DataFrame:
         """Get the latest N records.
         
+        Served from any cached unfiltered result that already covers the
+        last N rows (e.g. a previous ``limit >= n`` query) and was read under
+        the current data version. A repeated ``/cds/latest`` call then costs
+        only the version query, not the data select.
+        
         Args:
             n: Number of records to return
+            version: Data version from get_version(), if the caller already
+                has it (e.g. for an ETag); fetched when needed otherwise
             
         Returns:
             DataFrame with latest n records
         """
-        async with get_db_session() as session:
-            query = select(CDSData).order_by(desc(CDSData.date)).limit(n)
-            result = await session.execute(query)
-            records = result.scalars().all()
-            
-            if not records:
-                return pd.DataFrame(columns=["date", "open", "high", "low", "close", "change_pct"])
-            
-            data = [record.to_dict() for record in records]
-            df = pd.DataFrame(data)
-            df["date"] = pd.to_datetime(df["date"])
-            
-            # Sort by date ascending (oldest first)
-            df = df.sort_values("date").reset_index(drop=True)
-            
-            return df
+        if settings.DATA_CACHE_TTL > 0:
+            if version is None:
+                version = await self.get_version()
+            # Any cached unfiltered query covering at least n rows will do
+            for start_date, end_date, limit in list(self._data_cache):
+                if start_date is None and end_date is None and (limit is None or limit >= n):
+                    cached = self._cache_get((start_date, end_date, limit), version)
+                    if cached is not None:
+                        return cached.tail(n).copy().reset_index(drop=True)
+        
+        return await self.get_data(limit=n, version=version)
     
     async def get_stats(self) -> Dict:
         """Get basic statistics about the stored data.
@@ -166,10 +388,21 @@ class PostgresStorage:
             Dictionary with stats
         """
         async with get_db_session() as session:
-            # Count total records
-            count_query = select(func.count()).select_from(CDSData)
-            count_result = await session.execute(count_query)
-            total = count_result.scalar()
+            # Count, date range and latest close in a single round trip
+            latest_close = (
+                select(CDSData.close)
+                .order_by(desc(CDSData.date))
+                .limit(1)
+                .scalar_subquery()
+            )
+            query = select(
+                func.count(),
+                func.min(CDSData.date),
+                func.max(CDSData.date),
+                latest_close,
+            ).select_from(CDSData)
+            result = await session.execute(query)
+            total, oldest_date, latest_date, close = result.one()
             
             if total == 0:
                 return {
@@ -179,27 +412,36 @@ class PostgresStorage:
                     "latest_close": None,
                 }
             
-            # Get date range
-            min_date_query = select(func.min(CDSData.date))
-            min_result = await session.execute(min_date_query)
-            oldest_date = min_result.scalar()
-            
-            max_date_query = select(func.max(CDSData.date))
-            max_result = await session.execute(max_date_query)
-            latest_date = max_result.scalar()
-            
-            # Get latest close value
-            latest_query = select(CDSData).order_by(desc(CDSData.date)).limit(1)
-            latest_result = await session.execute(latest_query)
-            latest_record = latest_result.scalar_one_or_none()
-            
             return {
                 "total_records": total,
                 "oldest_date": oldest_date.isoformat() if oldest_date else None,
                 "latest_date": latest_date.isoformat() if latest_date else None,
-                "latest_close": float(latest_record.close) if latest_record and latest_record.close else None,
+                "latest_close": float(close) if close is not None else None,
             }
     
+    async def get_version(self) -> Tuple[Optional[str], int, Optional[str]]:
+        """Get a cheap fingerprint of the stored data.
+        
+        Changes whenever rows are added or updated, so it can back HTTP ETags.
+        
+        Returns:
+            Tuple of (latest date, total records, last update timestamp)
+        """
+        async with get_db_session() as session:
+            query = select(
+                func.max(CDSData.date),
+                func.count(),
+                func.max(CDSData.updated_at),
+            ).select_from(CDSData)
+            result = await session.execute(query)
+            latest_date, total, updated_at = result.one()
+            
+            return (
+                latest_date.isoformat() if latest_date else None,
+                total,
+                updated_at.isoformat() if updated_at else None,
+            )
+    
     async def delete_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> int:
         """Delete CDS data within date range.
         
@@ -223,6 +465,7 @@ class PostgresStorage:
             
             result = await session.execute(query)
             await session.commit()
+            self.clear_cache()
             
             deleted_count = result.rowcount
             logger.warning(f"Deleted {deleted_count} records from database")
@@ -1,4 +1,4 @@
 """Utilities package."""
-from src.utils.logger import setup_logging, get_logger
+from src.utils.logger import setup_logging, get_logger, log
 
-__all__ = ["setup_logging", "get_logger"]
+__all__ = ["setup_logging", "get_logger", "log"]
@@ -1,13 +1,74 @@
 """Logging utilities for the Brazilian CDS application."""
+import atexit
+import multiprocessing
+import os
+import socket
 import sys
-import logging
-from typing import Optional
+import threading
+import time
+from collections import deque
+from functools import cache, lru_cache
+from typing import Final, Optional
 
+import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import settings
 
+# Fast JSON for BetterStack batches, stdlib fallback
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    import json
+    _HAS_ORJSON = False
 
+# Direct handle for call sites that want to skip get_logger()
+log: Final = logger
+
+
+# Console formats: markup is only worth parsing when a terminal renders it
+COLORED_FMT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {message}"
+PLAIN_FMT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}"
+
+# loguru level names -> BetterStack level names (custom levels fall back to lowercase)
+_LEVEL_MAP = {
+    "TRACE": "debug",
+    "DEBUG": "debug",
+    "INFO": "info",
+    "SUCCESS": "info",
+    "WARNING": "warning",
+    "ERROR": "error",
+    "CRITICAL": "critical",
+}
+
+# Sinks installed by the last setup_logging() call; retired (stopped and
+# their atexit hooks removed) when logging is set up again
+_console: Optional["_BufferedStdout"] = None
+_sender: Optional["_BetterStackSender"] = None
+
+# Records dropped because the buffer was full, reported in aggregate by the
+# worker at most once per interval instead of once per lost record
+DROP_REPORT_INTERVAL = 60.0
+_dropped = 0
+_drop_lock = threading.Lock()
+
+# Resolved once; every forwarded record carries them
+_HOST = socket.gethostname()
+_PID = os.getpid()
+
+# Static part of the frame layout LogtailHandler used to send
+# (context.system), shared by every record instead of rebuilt per log
+_SYSTEM_CONTEXT = {
+    "pid": _PID,
+    "process_name": multiprocessing.current_process().name,
+    "hostname": _HOST,
+}
+
+
+@lru_cache(maxsize=4)
 def _build_ingest_url(host: str) -> str:
     """Return a proper HTTPS URL for Logtail ingestion based on provided host.
 
@@ -23,92 +84,373 @@ def _build_ingest_url(host: str) -> str:
     if not host:
         return "https://in.logtail.com"
     h = host.strip()
-    if not h.startswith("http://") and not h.startswith("https://"):
+    if not h.startswith(("http://", "https://")):
         h = f"https://{h}"
     return h.rstrip("/")
 
 
+class _BufferedStdout:
+    """Console sink that coalesces log lines into periodic writes.
+    
+    loguru flushes a stream sink after every record, so each log line costs a
+    write() syscall. This buffers lines and writes them in one go every
+    ``flush_interval`` seconds, or as soon as ``max_bytes`` are pending.
+    It deliberately has no ``flush`` method, so loguru cannot force a
+    per-record flush.
+    """
+    
+    def __init__(self, stream, flush_interval: float = 0.1, max_bytes: int = 8192):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._buffer: list = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(flush_interval,),
+            name="stdout-flusher",
+            daemon=True,
+        )
+        self._thread.start()
+    
+    def write(self, message: str) -> None:
+        with self._lock:
+            self._buffer.append(message)
+            self._size += len(message)
+            if self._size >= self._max_bytes:
+                self._drain()
+    
+    def stop(self) -> None:
+        """Flush what is pending and stop the timer (called by logger.remove())."""
+        self._stopped.set()
+        with self._lock:
+            self._drain()
+    
+    def _run(self, flush_interval: float) -> None:
+        while not self._stopped.wait(flush_interval):
+            with self._lock:
+                self._drain()
+    
+    def _drain(self) -> None:
+        # Caller holds the lock
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        try:
+            self._stream.write(data)
+            self._stream.flush()
+        except Exception:
+            pass
+
+
+def _json_default(value):
+    """Serialize what the JSON encoder can't (loguru's datetime subclass)."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(frames: list) -> bytes:
+    """Encode a batch of frames as a JSON array."""
+    if _HAS_ORJSON:
+        return orjson.dumps(frames, default=_json_default)
+    return json.dumps(frames, default=_json_default).encode("utf-8")
+
+
+def _build_session():
+    """Create the keep-alive session used for every BetterStack upload.
+    
+    A single worker posts one batch at a time, so a small pool is enough.
+    Transient failures (connection errors, 429/5xx) are retried with
+    backoff on the worker thread; POST has to be allowed explicitly since
+    urllib3 only retries idempotent methods by default.
+    
+    Returns:
+        Configured requests session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _post_batch(session, url: str, headers: dict, frames: list) -> None:
+    """POST a batch of frames to BetterStack as a single JSON array.
+    
+    Args:
+        session: Persistent requests session (keeps the connection alive)
+        url: Ingest URL
+        headers: Auth and content-type headers
+        frames: Frames to upload
+    """
+    try:
+        session.post(url, data=_dumps(frames), headers=headers, timeout=10)
+    except Exception:
+        # Never break the app due to logging failure
+        pass
+
+
+def _count_drop() -> None:
+    """Record one log record lost to a full buffer."""
+    global _dropped
+    with _drop_lock:
+        _dropped += 1
+
+
+def _report_drops() -> None:
+    """Log (and reset) how many records were dropped since the last report."""
+    global _dropped
+    with _drop_lock:
+        count, _dropped = _dropped, 0
+    if count:
+        logger.warning(f"BetterStack: {count} log records dropped (buffer full)")
+
+
+class _BetterStackSender:
+    """Batching uploader behind the BetterStack sink.
+    
+    The sink appends frames to ``buffer`` (a deque: atomic under the GIL, no
+    lock per record) and a daemon worker uploads them in batches, so logging
+    never waits on the network. The worker sleeps on ``wakeup``, which the
+    sink sets only once a full batch is pending. The HTTP session and the
+    worker are created on the first forwarded record, so a process that never
+    logs at the forwarding level never opens a connection.
+    """
+    
+    def __init__(self, url: str, headers: dict, batch_size: int, flush_interval: float):
+        self.url = url
+        self.headers = headers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: deque = deque()
+        self.wakeup = threading.Event()
+        self.started = threading.Event()
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+        self._session = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Create the upload session and start the worker thread, once."""
+        with self._start_lock:
+            if self.started.is_set() or self._stopped.is_set():
+                return
+            self._session = _build_session()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="betterstack-worker",
+                daemon=True,
+            )
+            self._thread.start()
+            self.started.set()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to drain the buffer and wait for it to exit."""
+        with self._start_lock:
+            self._stopped.set()
+        self.wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self) -> None:
+        """Drain the buffer, uploading up to ``batch_size`` records at a time.
+        
+        Wakes when the sink signals a full batch or every ``flush_interval``
+        seconds, then sends everything pending. Exits once stop was requested
+        and the buffer is empty.
+        """
+        buffer = self.buffer
+        popleft = buffer.popleft
+        next_report = time.monotonic() + DROP_REPORT_INTERVAL
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            
+            while buffer:
+                batch = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(popleft())
+                except IndexError:
+                    pass
+                
+                # The sink buffers the record's datetime as-is; it is formatted
+                # while encoding, off the thread that logged
+                _post_batch(self._session, self.url, self.headers, batch)
+            
+            if time.monotonic() >= next_report:
+                _report_drops()
+                next_report = time.monotonic() + DROP_REPORT_INTERVAL
+            
+            if self._stopped.is_set() and not buffer:
+                _report_drops()
+                return
+
+
+def _retire(sink) -> None:
+    """Stop a sink from a previous setup and drop its atexit hook."""
+    if sink is not None:
+        atexit.unregister(sink.stop)
+        sink.stop()
+
+
 def setup_logging() -> bool:
     """Configure loguru to log to console and forward to BetterStack when configured.
     
     Returns:
         True if BetterStack integration was successful, False otherwise
     """
-    # Reset sinks and add console sink
+    global _console, _sender
+    
+    # Reset sinks, stopping the background threads of a previous setup
     logger.remove()
+    _retire(_console)
+    _retire(_sender)
+    _console = _sender = None
+    
+    # Console sink. When piped (e.g. in containers) use the plain format and
+    # batch the writes; a terminal gets every line as soon as it is logged.
+    is_tty = sys.stdout.isatty()
+    if not is_tty:
+        _console = _BufferedStdout(sys.stdout)
+        atexit.register(_console.stop)
     logger.add(
-        sys.stdout,
+        sys.stdout if is_tty else _console,
         level=settings.LOG_LEVEL,
         enqueue=True,
         backtrace=False,
         diagnose=False,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {message}",
+        colorize=is_tty,
+        format=COLORED_FMT if is_tty else PLAIN_FMT,
     )
 
-    # Try lazy import of BetterStack (logtail) and set flag
-    has_betterstack = False
-    try:
-        from logtail import LogtailHandler
-        has_betterstack = True
-    except ImportError:
-        logger.debug("BetterStack library not installed (pip install logtail-python)")
+    # BetterStack forwarding
+    if not settings.BETTERSTACK_SOURCE_TOKEN:
+        logger.debug("BetterStack not configured (BETTERSTACK_SOURCE_TOKEN not set)")
         return False
 
-    # BetterStack forwarding
-    if has_betterstack and settings.BETTERSTACK_SOURCE_TOKEN:
-        try:
-            ingest_url = _build_ingest_url(settings.BETTERSTACK_INGESTING_HOST)
-            logtail_handler = LogtailHandler(
-                source_token=settings.BETTERSTACK_SOURCE_TOKEN,
-                host=ingest_url,
-            )
+    try:
+        ingest_url = _build_ingest_url(settings.BETTERSTACK_INGESTING_HOST)
+        headers = {
+            "Authorization": f"Bearer {settings.BETTERSTACK_SOURCE_TOKEN}",
+            "Content-Type": "application/json",
+        }
 
-            level_map = {
-                "TRACE": logging.DEBUG,
-                "DEBUG": logging.DEBUG,
-                "INFO": logging.INFO,
-                "SUCCESS": logging.INFO,
-                "WARNING": logging.WARNING,
-                "ERROR": logging.ERROR,
-                "CRITICAL": logging.CRITICAL,
-            }
-
-            def betterstack_sink(message):
-                rec = message.record
-                lvl = level_map.get(rec["level"].name, logging.INFO)
-                try:
-                    log_record = logging.LogRecord(
-                        name="loguru",
-                        level=lvl,
-                        pathname=rec["file"].path,
-                        lineno=rec["line"],
-                        msg=rec["message"],
-                        args=(),
-                        exc_info=None,
-                    )
-                    # Set created timestamp
-                    log_record.created = rec["time"].timestamp()
-                    log_record.funcName = rec["function"]
-                    logtail_handler.emit(log_record)
-                except Exception:
-                    # Never break the app due to logging failure
-                    pass
+        sender = _BetterStackSender(
+            ingest_url,
+            headers,
+            settings.BETTERSTACK_BATCH_SIZE,
+            settings.BETTERSTACK_FLUSH_INTERVAL,
+        )
 
-            logger.add(betterstack_sink, level="INFO")
-            logger.info(f"BetterStack forwarding enabled -> {ingest_url}")
-            return True
-        except Exception as e:
-            logger.warning(f"BetterStack setup failed: {e}")
-            return False
-    else:
-        if not settings.BETTERSTACK_SOURCE_TOKEN:
-            logger.debug("BetterStack not configured (BETTERSTACK_SOURCE_TOKEN not set)")
+        # Buffer operations, limits and lookup tables are bound as default
+        # arguments so each call resolves them as fast locals.
+        def betterstack_sink(
+            message,
+            _len=len,
+            _buffer=sender.buffer,
+            _append=sender.buffer.append,
+            _max=settings.BETTERSTACK_QUEUE_SIZE,
+            _full_batch=min(settings.BETTERSTACK_BATCH_SIZE, settings.BETTERSTACK_QUEUE_SIZE) - 1,
+            _is_awake=sender.wakeup.is_set,
+            _wake=sender.wakeup.set,
+            _levels=_LEVEL_MAP,
+            _system=_SYSTEM_CONTEXT,
+            _drop=_count_drop,
+            _started=sender.started.is_set,
+            _start=sender.start,
+        ):
+            if not _started():
+                _start()
+            
+            pending = _len(_buffer)
+            if pending >= _max:
+                # Drop instead of blocking when the worker falls behind
+                _drop()
+                return
+            
+            rec = message.record
+            level = rec["level"]
+            thread = rec["thread"]
+            try:
+                # Same layout LogtailHandler produced, so existing
+                # BetterStack queries on context.runtime/system keep working.
+                _append({
+                    "dt": rec["time"],
+                    "level": _levels.get(level.name) or level.name.lower(),
+                    "severity": level.no // 10,
+                    "message": rec["message"],
+                    "context": {
+                        "runtime": {
+                            "function": rec["function"],
+                            "file": rec["file"].path,
+                            "line": rec["line"],
+                            "thread_id": thread.id,
+                            "thread_name": thread.name,
+                            "logger_name": rec["name"],
+                        },
+                        "system": _system,
+                    },
+                })
+                if pending >= _full_batch and not _is_awake():
+                    _wake()
+            except Exception:
+                # Never break the app due to logging failure
+                pass
+
+        # Forward INFO and up, or only what the console shows when
+        # LOG_LEVEL is stricter. Resolved to a level number once here;
+        # loguru filters with an int compare before calling the sink
+        forward_level = max(logger.level(settings.LOG_LEVEL).no, logger.level("INFO").no)
+
+        # Announced before the sink exists, so this line alone does not
+        # start the worker
+        logger.info(f"BetterStack forwarding enabled -> {ingest_url}")
+
+        # No enqueue here: the sink only appends to a buffer, and our worker
+        # already gives it QueueHandler/QueueListener semantics. Enqueueing
+        # would pickle every record through loguru's multiprocessing queue
+        # just to reach a second queue.
+        # The sink only reads message.record, so render the cheapest
+        # possible text instead of loguru's full default format. loguru
+        # still appends the traceback for logger.exception() calls;
+        # without backtrace/diagnose it skips the extended frame walk
+        # and variable inspection the sink would throw away.
+        logger.add(
+            betterstack_sink,
+            level=forward_level,
+            enqueue=False,
+            format="{message}",
+            backtrace=False,
+            diagnose=False,
+        )
+        _sender = sender
+        atexit.register(sender.stop)
+        return True
+    except Exception as e:
+        logger.warning(f"BetterStack setup failed: {e}")
         return False
 
 
+@cache
 def get_logger():
     """Get the configured logger instance.
     
+    Prefer importing ``log`` directly; this is kept for existing call sites.
+    
     Returns:
         The loguru logger instance
     """
@@ -13,7 +13,6 @@ from lxml import html as lxhtml
 from requests.adapters import HTTPAdapter, Retry
 
 from loguru import logger
-from logtail import LogtailHandler  # logtail-python package
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -286,7 +285,7 @@ def setup_logging():
     # Try lazy import of BetterStack (logtail) and set flag so subsequent code knows availability.
     global HAS_BETTERSTACK
     try:
-        
+        from logtail import LogtailHandler  # logtail-python package (optional)
         HAS_BETTERSTACK = True
     except Exception:
         logtail_handler = None